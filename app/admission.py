@@ -0,0 +1,303 @@
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+
+# Clé partagée par les requêtes qui ne correspondent à aucune route
+ROUTE_INCONNUE = "*"
+
+
+def _env_int(nom: str, defaut: int) -> int:
+    valeur = os.getenv(nom)
+    return int(valeur) if valeur else defaut
+
+def _env_float(nom: str, defaut: float) -> float:
+    valeur = os.getenv(nom)
+    return float(valeur) if valeur else defaut
+
+
+class AdmissionConfig:
+    """
+    Paramètres du contrôle d'admission.
+
+    max_concurrence_globale borne le nombre de requêtes traitées simultanément par
+    le processus : la valeur par défaut (15) correspond au pool de connexions par
+    défaut de SQLAlchemy (5 + 10 en débordement) et reste sous les 40 threads du
+    threadpool. max_concurrence_route est la limite par défaut de chaque route,
+    remplaçable route par route via limites_routes. Une limite à 0 désactive la
+    limitation correspondante, un débit à 0 désactive la limitation par client.
+    """
+
+    def __init__(
+        self,
+        max_concurrence_globale: int = 15,
+        max_concurrence_route: int = 10,
+        taille_file: int = 64,
+        delai_file: float = 2.0,
+        retry_after: int = 1,
+        limites_routes: dict = None,
+        debit_par_client: float = 0.0,
+        rafale_par_client: int = 20,
+        chemins_exemptes: tuple = ("/admission",),
+    ):
+        self.max_concurrence_globale = max_concurrence_globale
+        self.max_concurrence_route = max_concurrence_route
+        self.taille_file = taille_file
+        self.delai_file = delai_file
+        self.retry_after = retry_after
+        self.limites_routes = limites_routes or {}
+        self.debit_par_client = debit_par_client
+        self.rafale_par_client = rafale_par_client
+        self.chemins_exemptes = chemins_exemptes
+
+    @classmethod
+    def from_env(cls) -> "AdmissionConfig":
+        """
+        Construit la configuration à partir des variables d'environnement.
+
+        ADMISSION_ROUTE_LIMITS a la forme "GET /clients/=20,POST /clients/=5".
+        """
+        limites = {}
+        for element in os.getenv("ADMISSION_ROUTE_LIMITS", "").split(","):
+            if "=" in element:
+                route, limite = element.rsplit("=", 1)
+                limites[route.strip()] = int(limite)
+        return cls(
+            max_concurrence_globale=_env_int("ADMISSION_GLOBAL_CONCURRENCY", 15),
+            max_concurrence_route=_env_int("ADMISSION_ROUTE_CONCURRENCY", 10),
+            taille_file=_env_int("ADMISSION_QUEUE_SIZE", 64),
+            delai_file=_env_float("ADMISSION_QUEUE_TIMEOUT", 2.0),
+            retry_after=_env_int("ADMISSION_RETRY_AFTER", 1),
+            limites_routes=limites,
+            debit_par_client=_env_float("RATE_LIMIT_PER_SECOND", 0.0),
+            rafale_par_client=_env_int("RATE_LIMIT_BURST", 20),
+        )
+
+
+class RouteLimiter:
+    """Limite de concurrence (processus ou route), avec une file d'attente bornée."""
+
+    def __init__(self, limite: int, taille_file: int, delai_file: float):
+        self.limite = limite
+        self.taille_file = taille_file
+        self.delai_file = delai_file
+        self.en_cours = 0
+        self.en_attente = 0
+        self.rejets = 0
+        self._semaphore = asyncio.Semaphore(limite)
+
+    async def acquire(self, delai: float = None) -> bool:
+        """
+        Réserve une place ; renvoie False si la requête doit être rejetée.
+
+        delai remplace delai_file lorsque la requête a déjà attendu ailleurs.
+        """
+        delai = self.delai_file if delai is None else delai
+        if self._semaphore.locked():
+            if self.en_attente >= self.taille_file or delai <= 0:
+                self.rejets += 1
+                return False
+            self.en_attente += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=delai)
+            except asyncio.TimeoutError:
+                self.rejets += 1
+                return False
+            finally:
+                self.en_attente -= 1
+        else:
+            await self._semaphore.acquire()
+        self.en_cours += 1
+        return True
+
+    def release(self) -> None:
+        self.en_cours -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "limite": self.limite,
+            "en_cours": self.en_cours,
+            "en_attente": self.en_attente,
+            "rejets": self.rejets,
+        }
+
+
+class TokenBucketLimiter:
+    """Limitation de débit par client (seau à jetons)."""
+
+    MAX_CLIENTS = 10000
+
+    def __init__(self, debit: float, rafale: int, horloge=time.monotonic):
+        self.debit = debit
+        self.rafale = rafale
+        self.horloge = horloge
+        self.rejets = 0
+        self._seaux = OrderedDict()
+
+    def allow(self, cle: str) -> float:
+        """Consomme un jeton ; renvoie 0 si autorisé, sinon l'attente en secondes."""
+        maintenant = self.horloge()
+        jetons, dernier = self._seaux.pop(cle, (self.rafale, maintenant))
+        jetons = min(self.rafale, jetons + (maintenant - dernier) * self.debit)
+        attente = 0.0
+        if jetons >= 1:
+            jetons -= 1
+        else:
+            attente = (1 - jetons) / self.debit
+            self.rejets += 1
+        self._seaux[cle] = (jetons, maintenant)
+        if len(self._seaux) > self.MAX_CLIENTS:
+            self._seaux.popitem(last=False)
+        return attente
+
+
+class AdmissionController:
+    """
+    État partagé du contrôle d'admission d'un processus.
+
+    Chaque worker uvicorn possède son propre contrôleur : les limites s'appliquent
+    par processus.
+    """
+
+    def __init__(self, config: AdmissionConfig = None):
+        self.config = config or AdmissionConfig()
+        self.routes = {}
+        self.limiteur_global = None
+        if self.config.max_concurrence_globale > 0:
+            self.limiteur_global = RouteLimiter(
+                self.config.max_concurrence_globale, self.config.taille_file, self.config.delai_file
+            )
+        self.limiteur_debit = None
+        if self.config.debit_par_client > 0:
+            self.limiteur_debit = TokenBucketLimiter(
+                self.config.debit_par_client, self.config.rafale_par_client
+            )
+
+    def limiter_for(self, route: str):
+        limite = self.config.limites_routes.get(route, self.config.max_concurrence_route)
+        if limite <= 0:
+            return None
+        limiteur = self.routes.get(route)
+        if limiteur is None:
+            limiteur = RouteLimiter(limite, self.config.taille_file, self.config.delai_file)
+            self.routes[route] = limiteur
+        return limiteur
+
+    async def acquire(self, route: str):
+        """
+        Admet une requête : limite de la route d'abord, puis limite globale.
+
+        Une requête en attente de sa route n'occupe pas de place globale, une route
+        saturée ne bloque donc pas les autres. Renvoie les limiteurs à libérer en fin
+        de requête (dans l'ordre inverse), ou None si la requête doit être rejetée.
+        Le délai d'attente est partagé entre les deux files.
+        """
+        acquis = []
+        debut = time.monotonic()
+        for limiteur in (self.limiter_for(route), self.limiteur_global):
+            if limiteur is None:
+                continue
+            restant = self.config.delai_file - (time.monotonic() - debut)
+            if not await limiteur.acquire(restant):
+                for limiteur_acquis in acquis:
+                    limiteur_acquis.release()
+                return None
+            acquis.insert(0, limiteur)
+        return acquis
+
+    def stats(self) -> dict:
+        routes = {route: limiteur.stats() for route, limiteur in self.routes.items()}
+        globale = self.limiteur_global.stats() if self.limiteur_global else None
+        rejets = sum(r["rejets"] for r in routes.values())
+        if globale is None:
+            en_cours = sum(r["en_cours"] for r in routes.values())
+            en_attente = sum(r["en_attente"] for r in routes.values())
+        else:
+            en_cours = globale["en_cours"]
+            en_attente = globale["en_attente"] + sum(r["en_attente"] for r in routes.values())
+            rejets += globale["rejets"]
+        return {
+            "en_cours": en_cours,
+            "en_attente": en_attente,
+            "rejets": rejets,
+            "rejets_debit": self.limiteur_debit.rejets if self.limiteur_debit else 0,
+            "global": globale,
+            "routes": routes,
+        }
+
+
+def _route_key(routes: list, scope, prefixe: str = "") -> str:
+    """
+    Modèle de la route qui traitera la requête ("GET /clients/{client_id}").
+
+    Les routes sont parcourues dans l'ordre de déclaration, comme le routeur. Les
+    requêtes sans route correspondante (chemin ou méthode inconnus) partagent la
+    clé ROUTE_INCONNUE, pour que le nombre de limiteurs reste borné.
+    """
+    for route in routes:
+        correspondance, _ = route.matches(scope)
+        if correspondance == Match.NONE:
+            continue
+        # Les versions récentes de FastAPI n'aplatissent plus les routeurs inclus :
+        # on descend dans le routeur d'origine, préfixe d'inclusion retiré
+        sous_routeur = getattr(route, "original_router", None)
+        if sous_routeur is not None:
+            prefixe_inclusion = getattr(getattr(route, "include_context", None), "prefix", "")
+            sous_scope = dict(scope, path=scope["path"][len(prefixe_inclusion):])
+            cle = _route_key(sous_routeur.routes, sous_scope, prefixe + prefixe_inclusion)
+            if cle != ROUTE_INCONNUE:
+                return cle
+        elif correspondance == Match.FULL:
+            return f"{scope['method']} {prefixe}{getattr(route, 'path', '')}"
+    return ROUTE_INCONNUE
+
+
+class AdmissionMiddleware:
+    """
+    Middleware ASGI de contrôle d'admission.
+
+    Les requêtes au-delà de la limite de débit reçoivent un 429, celles qui ne
+    trouvent pas de place à temps un 503, toutes deux avec un en-tête Retry-After.
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.controller.config.chemins_exemptes:
+            await self.app(scope, receive, send)
+            return
+
+        limiteur_debit = self.controller.limiteur_debit
+        if limiteur_debit is not None:
+            client = scope.get("client")
+            attente = limiteur_debit.allow(client[0] if client else "inconnu")
+            if attente > 0:
+                response = JSONResponse(
+                    {"detail": "Trop de requêtes, veuillez réessayer plus tard"},
+                    status_code=429,
+                    headers={"Retry-After": str(math.ceil(attente))},
+                )
+                await response(scope, receive, send)
+                return
+
+        acquis = await self.controller.acquire(_route_key(scope["app"].router.routes, scope))
+        if acquis is None:
+            response = JSONResponse(
+                {"detail": "Service surchargé, veuillez réessayer plus tard"},
+                status_code=503,
+                headers={"Retry-After": str(self.controller.config.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            for limiteur in acquis:
+                limiteur.release()
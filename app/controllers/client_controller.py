@@ -1,9 +1,10 @@
+from datetime import date
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.schemas import ClientCreate, ClientUpdate
-from app.services import client_service
+from app.services import client_service, stats_service
 
 def create_client(client_data: ClientCreate, db: Session):
     try:
@@ -18,6 +19,9 @@ def create_client(client_data: ClientCreate, db: Session):
 def list_clients(skip: int, limit: int, actif: bool, db: Session):
     return client_service.get_clients(db, skip, limit, actif)
 
+def get_client_stats(depuis: date, db: Session):
+    return stats_service.get_stats(db, depuis)
+
 def get_client(client_id: int, db: Session):
     client = client_service.get_client_by_id(db, client_id)
     if client is None:
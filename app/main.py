@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.admission import AdmissionConfig, AdmissionController, AdmissionMiddleware
 from app.database import engine
 from app.routers.client_router import router as client_router
 from app import models
@@ -15,6 +16,10 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Contrôle d'admission (limite globale et par route, file d'attente bornée)
+admission = AdmissionController(AdmissionConfig.from_env())
+app.add_middleware(AdmissionMiddleware, controller=admission)
+
 # Configuration CORS
 app.add_middleware(
     CORSMiddleware,
@@ -30,4 +35,9 @@ app.include_router(client_router)
 @app.get("/")
 def read_root():
     """Endpoint racine de l'API."""
-    return {"message": "Bienvenue sur l'API de gestion des clients"}
\ No newline at end of file
+    return {"message": "Bienvenue sur l'API de gestion des clients"}
+
+@app.get("/admission")
+def read_admission():
+    """Requêtes en cours, en attente et rejetées par le contrôle d'admission."""
+    return admission.stats()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -14,4 +14,22 @@ class Client(Base):
     telephone = Column(String)
     actif = Column(Boolean, default=True)
     date_creation = Column(DateTime(timezone=True), server_default=func.now())
-    date_modification = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    date_modification = Column(DateTime(timezone=True), onupdate=func.now())
+
+class ClientStatistiques(Base):
+    """Agrégats globaux sur les clients (une seule ligne, id = 1)."""
+
+    __tablename__ = "client_statistiques"
+
+    id = Column(Integer, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    actifs = Column(Integer, nullable=False, default=0)
+
+
+class ClientCreationsJour(Base):
+    """Nombre de clients créés par jour (clients encore présents)."""
+
+    __tablename__ = "client_creations_jour"
+
+    jour = Column(Date, primary_key=True)
+    nombre = Column(Integer, nullable=False, default=0)
@@ -1,9 +1,10 @@
+from datetime import date
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
 from app.controllers import client_controller
 from app.database import get_db
-from app.schemas import ClientCreate, ClientResponse, ClientUpdate, ClientList
+from app.schemas import ClientCreate, ClientResponse, ClientUpdate, ClientList, ClientStats
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
@@ -15,6 +16,10 @@ def create_client(client: ClientCreate, db: Session = Depends(get_db)):
 def list_clients(skip: int = 0, limit: int = 100, actif: bool = None, db: Session = Depends(get_db)):
     return client_controller.list_clients(skip, limit, actif, db)
 
+@router.get("/stats", response_model=ClientStats)
+def get_client_stats(depuis: date = None, db: Session = Depends(get_db)):
+    return client_controller.get_client_stats(depuis, db)
+
 @router.get("/{client_id}", response_model=ClientResponse)
 def get_client(client_id: int, db: Session = Depends(get_db)):
     return client_controller.get_client(client_id, db)
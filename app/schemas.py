@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
 from pydantic import BaseModel, EmailStr, Field,ConfigDict
 
@@ -33,4 +33,18 @@ class ClientResponse(ClientBase):
 class ClientList(BaseModel):
     """Schéma pour la liste des clients."""
     clients: List[ClientResponse]
-    total: int
\ No newline at end of file
+    total: int
+
+class CreationsJour(BaseModel):
+    """Schéma pour le nombre de créations de clients sur une journée."""
+    jour: date
+    nombre: int
+    model_config = ConfigDict(from_attributes = True)
+
+
+class ClientStats(BaseModel):
+    """Schéma pour les statistiques sur les clients."""
+    total: int
+    actifs: int
+    inactifs: int
+    creations_par_jour: List[CreationsJour]
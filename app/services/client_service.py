@@ -1,10 +1,16 @@
 from sqlalchemy.orm import Session
 from app.models import Client
 from app.schemas import ClientCreate, ClientUpdate
+from app.services import stats_service
 
 def create_client_in_db(db: Session, client_data: ClientCreate) -> Client:
     db_client = Client(**client_data.model_dump())
     db.add(db_client)
+    db.flush()
+    db.refresh(db_client)
+    stats_service.apply_client_delta(
+        db, total=1, actifs=int(bool(db_client.actif)), jour=db_client.date_creation.date()
+    )
     db.commit()
     db.refresh(db_client)
     return db_client
@@ -24,8 +30,12 @@ def update_client_in_db(db: Session, client_id: int, update_data: ClientUpdate)
     client = db.query(Client).filter(Client.id == client_id).first()
     if client is None:
         raise ValueError("Client non trouvé")
+    etait_actif = bool(client.actif)
     for key, value in update_data.model_dump(exclude_unset=True).items():
         setattr(client, key, value)
+    db.flush()
+    if bool(client.actif) != etait_actif:
+        stats_service.apply_client_delta(db, actifs=1 if client.actif else -1)
     db.commit()
     db.refresh(client)
     return client
@@ -34,6 +44,10 @@ def delete_client_from_db(db: Session, client_id: int) -> bool:
     client = db.query(Client).filter(Client.id == client_id).first()
     if client is None:
         return False
+    actif = bool(client.actif)
+    jour = client.date_creation.date() if client.date_creation else None
     db.delete(client)
+    db.flush()
+    stats_service.apply_client_delta(db, total=-1, actifs=-int(actif), jour=jour)
     db.commit()
     return True
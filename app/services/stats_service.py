@@ -0,0 +1,92 @@
+from datetime import date
+from sqlalchemy import func, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.models import Client, ClientStatistiques, ClientCreationsJour
+
+STATS_ID = 1
+
+def _en_date(valeur) -> date:
+    # SQLite renvoie func.date() sous forme de chaîne "AAAA-MM-JJ"
+    if isinstance(valeur, str):
+        return date.fromisoformat(valeur)
+    return valeur
+
+def _upsert_stats(db: Session, total: int, actifs: int) -> None:
+    instruction = insert(ClientStatistiques).values(id=STATS_ID, total=total, actifs=actifs)
+    db.execute(instruction.on_conflict_do_update(
+        index_elements=[ClientStatistiques.id],
+        set_={"total": instruction.excluded.total, "actifs": instruction.excluded.actifs},
+    ))
+
+def _ajouter_creations(db: Session, jour: date, nombre: int) -> None:
+    # Upsert : deux créations simultanées le même jour ne se heurtent pas à la clé primaire
+    instruction = insert(ClientCreationsJour).values(jour=jour, nombre=nombre)
+    db.execute(instruction.on_conflict_do_update(
+        index_elements=[ClientCreationsJour.jour],
+        set_={"nombre": ClientCreationsJour.nombre + instruction.excluded.nombre},
+    ))
+
+def rebuild_stats(db: Session, commit: bool = True) -> ClientStatistiques:
+    """Recalcule entièrement les agrégats à partir de la table clients."""
+    total = db.query(func.count(Client.id)).scalar()
+    actifs = db.query(func.count(Client.id)).filter(Client.actif == True).scalar()
+    _upsert_stats(db, total, actifs)
+
+    db.query(ClientCreationsJour).delete(synchronize_session=False)
+    jour = func.date(Client.date_creation)
+    for valeur, nombre in db.query(jour, func.count(Client.id)).group_by(jour).all():
+        if valeur is not None:
+            _ajouter_creations(db, _en_date(valeur), nombre)
+
+    if commit:
+        db.commit()
+    return db.get(ClientStatistiques, STATS_ID, populate_existing=True)
+
+def apply_client_delta(db: Session, total: int = 0, actifs: int = 0, jour: date = None) -> None:
+    """
+    Répercute une modification de client sur les agrégats, sans commit.
+
+    Les changements sur la table clients doivent déjà avoir été flushés : si les
+    agrégats n'existent pas encore, ils sont reconstruits à partir de cet état.
+    """
+    resultat = db.execute(
+        update(ClientStatistiques)
+        .where(ClientStatistiques.id == STATS_ID)
+        .values(
+            total=ClientStatistiques.total + total,
+            actifs=ClientStatistiques.actifs + actifs,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if resultat.rowcount == 0:
+        rebuild_stats(db, commit=False)
+        return
+
+    if jour is None or total == 0:
+        return
+    if total > 0:
+        _ajouter_creations(db, jour, total)
+    else:
+        db.execute(
+            update(ClientCreationsJour)
+            .where(ClientCreationsJour.jour == jour)
+            .values(nombre=ClientCreationsJour.nombre + total)
+            .execution_options(synchronize_session=False)
+        )
+
+def get_stats(db: Session, depuis: date = None):
+    stats = db.get(ClientStatistiques, STATS_ID)
+    if stats is None:
+        stats = rebuild_stats(db)
+
+    query = db.query(ClientCreationsJour).filter(ClientCreationsJour.nombre > 0)
+    if depuis is not None:
+        query = query.filter(ClientCreationsJour.jour >= depuis)
+    creations = query.order_by(ClientCreationsJour.jour).all()
+    return {
+        "total": stats.total,
+        "actifs": stats.actifs,
+        "inactifs": stats.total - stats.actifs,
+        "creations_par_jour": creations,
+    }
@@ -0,0 +1,12 @@
+from app.database import SessionLocal, engine
+from app import models
+from app.services.stats_service import rebuild_stats
+
+if __name__ == "__main__":
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        stats = rebuild_stats(db)
+        print(f"Statistiques reconstruites : {stats.total} clients, {stats.actifs} actifs")
+    finally:
+        db.close()
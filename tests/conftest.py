@@ -43,7 +43,7 @@ def test_engine():
         print(f"Impossible de supprimer test_client_db.sqlite : {e}")
 
 @pytest.fixture(scope="function")
-def test_db_function(test_engine):
+def test_db(test_engine):
     """Crée une session de base de données de test."""
     testing_session_local = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
     db = testing_session_local()
@@ -1,3 +1,4 @@
+from datetime import date, timedelta
 import pytest
 from fastapi import status
 
@@ -184,4 +185,82 @@ def test_list_clients_with_pagination(client, sample_clients):
     data = response.json()
     assert data["total"] == 3
     assert len(data["clients"]) == 1
-    assert data["clients"][0]["id"] != sample_clients[0].id  # Différent du premier client
\ No newline at end of file
+    assert data["clients"][0]["id"] != sample_clients[0].id  # Différent du premier client
+
+def test_client_stats(client, sample_clients):
+    """Test des statistiques sur les clients."""
+    response = client.get("/clients/stats")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total"] == 3
+    assert data["actifs"] == 2
+    assert data["inactifs"] == 1
+    assert sum(jour["nombre"] for jour in data["creations_par_jour"]) == 3
+
+def test_client_stats_follow_changes(client, sample_clients):
+    """Test de la mise à jour des statistiques lors des modifications de clients."""
+    actif_id = sample_clients[0].id
+    inactif_id = sample_clients[2].id
+    client.get("/clients/stats")
+
+    # Création d'un client actif
+    response = client.post(
+        "/clients/",
+        json={
+            "nom": "Doe",
+            "prenom": "John",
+            "email": "john.doe@example.com",
+            "actif": True
+        }
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    data = client.get("/clients/stats").json()
+    assert data["total"] == 4
+    assert data["actifs"] == 3
+    assert data["inactifs"] == 1
+    assert sum(jour["nombre"] for jour in data["creations_par_jour"]) == 4
+
+    # Passage d'un client actif à inactif
+    response = client.put(f"/clients/{actif_id}", json={"actif": False})
+    assert response.status_code == status.HTTP_200_OK
+    data = client.get("/clients/stats").json()
+    assert data["total"] == 4
+    assert data["actifs"] == 2
+    assert data["inactifs"] == 2
+
+    # Suppression d'un client inactif
+    response = client.delete(f"/clients/{inactif_id}")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    data = client.get("/clients/stats").json()
+    assert data["total"] == 3
+    assert data["actifs"] == 2
+    assert data["inactifs"] == 1
+    assert sum(jour["nombre"] for jour in data["creations_par_jour"]) == 3
+
+def test_client_stats_depuis(client, sample_clients):
+    """Test du filtre par date sur les créations par jour."""
+    data = client.get("/clients/stats").json()
+    dernier_jour = date.fromisoformat(data["creations_par_jour"][-1]["jour"])
+
+    response = client.get(f"/clients/stats?depuis={dernier_jour.isoformat()}")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [jour["jour"] for jour in data["creations_par_jour"]] == [dernier_jour.isoformat()]
+    assert data["creations_par_jour"][0]["nombre"] == 3
+
+    lendemain = dernier_jour + timedelta(days=1)
+    data = client.get(f"/clients/stats?depuis={lendemain.isoformat()}").json()
+    assert data["creations_par_jour"] == []
+    assert data["total"] == 3
+
+def test_admission_stats(client):
+    """Test de l'exposition des compteurs du contrôle d'admission."""
+    client.get("/clients/")
+    response = client.get("/admission")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["en_cours"] == 0
+    assert data["rejets"] == 0
+    assert "GET /clients/" in data["routes"]
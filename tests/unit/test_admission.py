@@ -0,0 +1,256 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.admission import (
+    ROUTE_INCONNUE,
+    AdmissionConfig,
+    AdmissionController,
+    AdmissionMiddleware,
+    RouteLimiter,
+    TokenBucketLimiter,
+    _route_key,
+)
+
+def test_route_limiter_sheds_when_queue_full():
+    """Test unitaire du rejet immédiat quand la file d'attente est pleine."""
+    async def scenario():
+        limiteur = RouteLimiter(limite=1, taille_file=0, delai_file=1.0)
+        assert await limiteur.acquire()
+        assert not await limiteur.acquire()
+        limiteur.release()
+        assert await limiteur.acquire()
+        return limiteur.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["en_cours"] == 1
+    assert stats["rejets"] == 1
+
+def test_route_limiter_queue_deadline():
+    """Test unitaire du délai maximal d'attente dans la file."""
+    async def scenario():
+        limiteur = RouteLimiter(limite=1, taille_file=1, delai_file=0.05)
+        assert await limiteur.acquire()
+        assert not await limiteur.acquire()
+        return limiteur.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["en_attente"] == 0
+    assert stats["rejets"] == 1
+
+def test_route_limiter_queued_request_admitted():
+    """Test unitaire de l'admission d'une requête en attente lorsqu'une place se libère."""
+    async def scenario():
+        limiteur = RouteLimiter(limite=1, taille_file=1, delai_file=1.0)
+        assert await limiteur.acquire()
+        attente = asyncio.create_task(limiteur.acquire())
+        await asyncio.sleep(0)
+        assert limiteur.en_attente == 1
+        limiteur.release()
+        return await attente
+
+    assert asyncio.run(scenario())
+
+def test_token_bucket():
+    """Test unitaire de la limitation de débit par client."""
+    maintenant = [0.0]
+    limiteur = TokenBucketLimiter(debit=1.0, rafale=2, horloge=lambda: maintenant[0])
+
+    assert limiteur.allow("a") == 0
+    assert limiteur.allow("a") == 0
+    assert limiteur.allow("a") > 0
+    assert limiteur.allow("b") == 0
+    maintenant[0] = 1.0
+    assert limiteur.allow("a") == 0
+    assert limiteur.rejets == 1
+
+def test_controller_route_limits():
+    """Test unitaire des limites par route et de leur désactivation."""
+    controller = AdmissionController(
+        AdmissionConfig(max_concurrence_route=10, limites_routes={"GET /clients/": 2, "GET /": 0})
+    )
+
+    assert controller.limiter_for("GET /clients/").limite == 2
+    assert controller.limiter_for("POST /clients/").limite == 10
+    assert controller.limiter_for("GET /") is None
+    assert controller.stats()["rejets"] == 0
+
+def test_controller_global_limit():
+    """Test unitaire de la limite globale, commune à toutes les routes."""
+    async def scenario():
+        controller = AdmissionController(
+            AdmissionConfig(max_concurrence_globale=1, max_concurrence_route=5, taille_file=0)
+        )
+        acquis = await controller.acquire("GET /clients/")
+        assert acquis is not None
+        assert await controller.acquire("POST /clients/") is None
+        for limiteur in acquis:
+            limiteur.release()
+        return controller.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["en_cours"] == 0
+    assert stats["rejets"] == 1
+    assert stats["global"]["rejets"] == 1
+    assert "POST /clients/" in stats["routes"]
+
+def _test_app(config: AdmissionConfig):
+    """Petite application dont la route /items/{item_id} bloque jusqu'à libération."""
+    liberer = threading.Event()
+    controller = AdmissionController(config)
+    test_app = FastAPI()
+    test_app.add_middleware(AdmissionMiddleware, controller=controller)
+
+    @test_app.get("/items/stats")
+    def items_stats():
+        return {"ok": True}
+
+    @test_app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        liberer.wait(timeout=5)
+        return {"id": item_id}
+
+    @test_app.get("/admission")
+    def read_admission():
+        return controller.stats()
+
+    return test_app, controller, liberer
+
+@contextmanager
+def _requete_en_cours(test_client, controller, liberer):
+    """Occupe une place sur /items/1 le temps du bloc."""
+    thread = threading.Thread(target=test_client.get, args=("/items/1",))
+    thread.start()
+    debut = time.monotonic()
+    while controller.stats()["en_cours"] < 1 and time.monotonic() - debut < 5:
+        time.sleep(0.01)
+    try:
+        yield
+    finally:
+        liberer.set()
+        thread.join()
+
+def test_middleware_sheds_when_queue_full():
+    """Test du rejet en 503 quand la file est pleine, hors chemins exemptés."""
+    config = AdmissionConfig(max_concurrence_globale=1, max_concurrence_route=1, taille_file=0)
+    test_app, controller, liberer = _test_app(config)
+
+    with TestClient(test_app) as test_client:
+        with _requete_en_cours(test_client, controller, liberer):
+            response = test_client.get("/items/2")
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "1"
+
+            # La limite globale s'applique aussi aux autres routes
+            assert test_client.get("/items/stats").status_code == 503
+
+            response = test_client.get("/admission")
+            assert response.status_code == 200
+            assert response.json()["en_cours"] == 1
+            assert response.json()["rejets"] == 2
+
+        assert test_client.get("/items/2").status_code == 200
+
+def test_middleware_queue_deadline():
+    """Test du rejet en 503 quand le délai d'attente dans la file est dépassé."""
+    config = AdmissionConfig(max_concurrence_route=1, taille_file=1, delai_file=0.05)
+    test_app, controller, liberer = _test_app(config)
+
+    with TestClient(test_app) as test_client:
+        with _requete_en_cours(test_client, controller, liberer):
+            response = test_client.get("/items/2")
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "1"
+
+def _scope(methode: str, chemin: str) -> dict:
+    return {"type": "http", "method": methode, "path": chemin, "root_path": "", "headers": []}
+
+def test_route_key():
+    """Test du regroupement des requêtes par route, dans l'ordre de déclaration."""
+    routeur = APIRouter(prefix="/items")
+
+    @routeur.get("/{item_id}")
+    def get_item(item_id: str):
+        return {"id": item_id}
+
+    @routeur.get("/stats")
+    def items_stats():
+        return {"ok": True}
+
+    test_app = FastAPI()
+
+    @test_app.get("/export.csv")
+    def export():
+        return {}
+
+    test_app.include_router(routeur, prefix="/v1")
+    routes = test_app.router.routes
+
+    assert _route_key(routes, _scope("GET", "/v1/items/3")) == "GET /v1/items/{item_id}"
+    # "/items/{item_id}" est déclarée en premier : c'est elle qui traite "/items/stats"
+    assert _route_key(routes, _scope("GET", "/v1/items/stats")) == "GET /v1/items/{item_id}"
+    assert _route_key(routes, _scope("GET", "/export.csv")) == "GET /export.csv"
+    assert _route_key(routes, _scope("GET", "/exportXcsv")) == ROUTE_INCONNUE
+    assert _route_key(routes, _scope("GET", "/docs")) == "GET /docs"
+    assert _route_key(routes, _scope("POST", "/v1/items/3")) == ROUTE_INCONNUE
+
+def test_middleware_route_key():
+    """Test de l'isolation des routes par le middleware."""
+    config = AdmissionConfig(max_concurrence_globale=0, max_concurrence_route=1, taille_file=0)
+    test_app, controller, liberer = _test_app(config)
+
+    with TestClient(test_app) as test_client:
+        with _requete_en_cours(test_client, controller, liberer):
+            assert test_client.get("/items/2").status_code == 503
+            assert test_client.get("/items/stats").status_code == 200
+
+def test_middleware_saturated_route_does_not_block_others():
+    """Test qu'une route saturée, file d'attente comprise, ne bloque pas les autres routes."""
+    config = AdmissionConfig(
+        max_concurrence_globale=2, max_concurrence_route=1, taille_file=5, delai_file=2.0
+    )
+    test_app, controller, liberer = _test_app(config)
+
+    with TestClient(test_app) as test_client:
+        with _requete_en_cours(test_client, controller, liberer):
+            en_attente = threading.Thread(target=test_client.get, args=("/items/2",))
+            en_attente.start()
+            debut = time.monotonic()
+            while controller.stats()["en_attente"] < 1 and time.monotonic() - debut < 5:
+                time.sleep(0.01)
+
+            debut = time.monotonic()
+            assert test_client.get("/items/stats").status_code == 200
+            assert time.monotonic() - debut < 1.0
+            stats = controller.stats()
+            assert stats["global"]["en_cours"] == 1
+            assert stats["routes"]["GET /items/{item_id}"]["en_attente"] == 1
+        en_attente.join()
+
+def test_middleware_unknown_methods_share_key():
+    """Test que les méthodes inconnues ne créent pas un limiteur chacune."""
+    test_app, controller, liberer = _test_app(AdmissionConfig())
+
+    with TestClient(test_app) as test_client:
+        for methode in ("FOO", "BAR", "QUUX", "ZZZ"):
+            test_client.request(methode, "/items/stats")
+        test_client.get("/inconnu")
+
+    assert set(controller.stats()["routes"]) == {ROUTE_INCONNUE}
+
+def test_middleware_rate_limit():
+    """Test du rejet en 429 par la limitation de débit par client."""
+    config = AdmissionConfig(debit_par_client=1.0, rafale_par_client=1)
+    test_app, controller, liberer = _test_app(config)
+    liberer.set()
+
+    with TestClient(test_app) as test_client:
+        assert test_client.get("/items/stats").status_code == 200
+        response = test_client.get("/items/stats")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+        assert test_client.get("/admission").json()["rejets_debit"] == 1
@@ -0,0 +1,51 @@
+from datetime import date
+import pytest
+from app.database import Base
+from app.models import Client, ClientStatistiques, ClientCreationsJour
+from app.services.stats_service import rebuild_stats, get_stats, apply_client_delta
+
+def _vider_tables(db):
+    db.rollback()
+    for table in reversed(Base.metadata.sorted_tables):
+        db.execute(table.delete())
+    db.commit()
+
+@pytest.fixture(scope="function")
+def stats_db(test_db):
+    """Session de test sur des tables vides, nettoyées après chaque test."""
+    _vider_tables(test_db)
+    yield test_db
+    _vider_tables(test_db)
+
+def test_rebuild_stats(stats_db):
+    """Test unitaire de la reconstruction des statistiques après une dérive."""
+    stats_db.add_all([
+        Client(nom="Bernard", prenom="Luc", email="luc.bernard@example.com", actif=True),
+        Client(nom="Petit", prenom="Anne", email="anne.petit@example.com", actif=False),
+    ])
+    stats_db.commit()
+    stats_db.merge(ClientStatistiques(id=1, total=-1, actifs=-1))
+    stats_db.commit()
+
+    rebuild_stats(stats_db)
+    stats = get_stats(stats_db)
+
+    assert stats["total"] == 2
+    assert stats["actifs"] == 1
+    assert stats["inactifs"] == 1
+    assert sum(jour.nombre for jour in stats["creations_par_jour"]) == 2
+
+def test_apply_client_delta_existing_day(stats_db):
+    """Test unitaire de l'incrément des compteurs et d'un jour déjà présent."""
+    rebuild_stats(stats_db)
+    aujourd_hui = date.today()
+
+    apply_client_delta(stats_db, total=1, actifs=1, jour=aujourd_hui)
+    apply_client_delta(stats_db, total=1, actifs=0, jour=aujourd_hui)
+    stats_db.commit()
+
+    stats = stats_db.get(ClientStatistiques, 1, populate_existing=True)
+    assert stats.total == 2
+    assert stats.actifs == 1
+    jour = stats_db.get(ClientCreationsJour, aujourd_hui, populate_existing=True)
+    assert jour.nombre == 2